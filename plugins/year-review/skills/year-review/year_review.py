@@ -12,15 +12,55 @@ Data sources:
 - ~/.claude/stats-cache.json (v2.0.64+)
 - ~/.claude/history.jsonl
 - ~/.claude/projects/*/*.jsonl
+
+Runtime: a single pure-Python file for CPython 3.8+. orjson and NumPy
+speed up large histories when installed, but neither is required.
 """
 
+from __future__ import annotations
+
 import json
+import random
 import sys
 import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from datetime import datetime
-from collections import defaultdict, Counter
+from collections import defaultdict
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
+
+# Design decision: orjson is optional
+# - JSONL parsing dominates runtime for heavy users (millions of lines)
+# - orjson is a drop-in for json.loads/dumps and several times faster
+# - Falls back to stdlib json so the script stays zero-dependency
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+# need to catch the latter.
+try:
+    import orjson
+
+    def _json_loads(data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects lone surrogate escapes (e.g. a truncated emoji
+            # written by JSON.stringify) that stdlib json accepts
+            return json.loads(data)
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# NumPy is optional too: when present, timestamp histograms are built with
+# one vectorized pass instead of a Python loop over every history record
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
@@ -85,9 +125,83 @@ EXTENSION_TO_LANG = {
     'ipynb': 'Jupyter',
 }
 
+# Tools whose input.file_path is a file the user changed; of those,
+# WRITE_TOOLS create files and the rest edit existing ones
+FILE_TOOLS = frozenset(('Edit', 'Write'))
+WRITE_TOOLS = frozenset(('Write',))
+
+# Matched as substrings of the lowercased prompt. Plain `in` checks beat a
+# re.IGNORECASE alternation here: sre retries every alternative at each
+# position, which measured ~10x slower on long prompts.
+ERROR_INDICATORS = ('error', 'fail', 'bug', 'issue', 'broken', 'crash', 'exception', 'not working')
+# Prompts mentioning these are never sampled (privacy); matched the same way
+SENSITIVE_KEYWORDS = ('password', 'secret', 'api_key', 'apikey', 'token', 'credential', 'private_key')
+
+# Index matches datetime.weekday()
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# UTC offsets (including DST shifts) are whole multiples of 15 minutes, so
+# every timestamp in the same UTC quarter-hour has the same local weekday/hour
+QUARTER_HOUR_MS = 15 * 60 * 1000
+
+# Below this many session files, parse serially (pool startup isn't worth it)
+PARALLEL_MIN_FILES = 16
+
+
+def _top(counts: dict, n: int) -> dict:
+    """Top n entries by count, ties in first-seen order.
+
+    Same result as Counter.most_common(n), i.e. an O(N log n) heap
+    selection, without Counter's subclass overhead while accumulating.
+    """
+    return dict(nlargest(n, counts.items(), key=itemgetter(1)))
+
+
+def _iter_jsonl(path: str) -> Iterator[Any]:
+    """Yield parsed records from a JSONL file, skipping malformed lines.
+
+    The file is memory-mapped and each line is handed to the parser as
+    bytes, so there is no text-mode decoding or newline translation.
+    Raises OSError if the file can't be read.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap rejects empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                try:
+                    yield _json_loads(line)
+                except ValueError:
+                    # JSONDecodeError, or invalid UTF-8 under stdlib json;
+                    # blank lines land here too
+                    continue
+
+
+def _iter_session_records(path: str) -> Iterator[Any]:
+    """Yield records from one session file; an unreadable file yields none."""
+    try:
+        yield from _iter_jsonl(path)
+    except IOError:
+        return
 
-def load_data() -> tuple[dict, list[dict], list[dict]]:
-    """Load all Claude Code data."""
+
+@dataclass
+class HistoryColumns:
+    """Prompt history as index-aligned columns, one list per field used.
+
+    Only the hot fields are kept, so the parsed record dicts are freed as
+    soon as they are read and the analyzers iterate flat lists.
+    """
+    displays: list[str] = field(default_factory=list)
+    timestamps: list[int] = field(default_factory=list)
+    projects: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.displays)
+
+
+def load_data() -> tuple[dict, HistoryColumns]:
+    """Load stats cache and prompt history."""
     claude_dir = Path.home() / '.claude'
 
     # Stats cache
@@ -95,197 +209,322 @@ def load_data() -> tuple[dict, list[dict], list[dict]]:
     stats_path = claude_dir / 'stats-cache.json'
     if stats_path.exists():
         try:
-            with open(stats_path, encoding='utf-8') as f:
-                stats = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(stats_path, 'rb') as f:
+                stats = _json_loads(f.read())
+        except (ValueError, IOError) as e:
+            # ValueError: JSONDecodeError, or invalid UTF-8 under stdlib json
             logger.warning(f"Failed to load stats-cache.json: {e}")
 
     # History
-    history: list[dict] = []
+    history = HistoryColumns()
     history_path = claude_dir / 'history.jsonl'
     if history_path.exists():
+        add_display = history.displays.append
+        add_timestamp = history.timestamps.append
+        add_project = history.projects.append
         try:
-            with open(history_path, encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            history.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue
+            for record in _iter_jsonl(str(history_path)):
+                add_display(record.get('display', ''))
+                add_timestamp(record.get('timestamp', 0))
+                add_project(record.get('project', ''))
         except IOError as e:
             logger.warning(f"Failed to read history.jsonl: {e}")
 
-    # Session files
-    sessions_data: list[dict] = []
-    projects_dir = claude_dir / 'projects'
-    if projects_dir.exists():
-        for proj_dir in projects_dir.iterdir():
-            if not proj_dir.is_dir() or proj_dir.name.startswith('.'):
-                continue
-            for session_file in proj_dir.glob('*.jsonl'):
-                try:
-                    with open(session_file, encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    sessions_data.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    continue
-                except IOError:
-                    continue
+    return stats, history
+
+
+def iter_session_tallies() -> Iterator[dict]:
+    """Yield one tool/file tally per ~/.claude/projects/*/*.jsonl file.
+
+    Each file is reduced as it is parsed, so no record outlives its file and
+    only small count dicts are passed around.
+    """
+    # Design decision: Tally session files in a process pool
+    # - Each file is independent and JSON decoding is CPU-bound (holds the GIL)
+    # - Workers return per-file counts, not records: unpickling full records
+    #   in the parent costs about as much as parsing them
+    # - Small workloads and single-core machines stay serial; the pool would
+    #   cost more than it saves
+    projects_dir = Path.home() / '.claude' / 'projects'
+    if not projects_dir.exists():
+        return
+
+    session_files = [
+        str(session_file)
+        for proj_dir in projects_dir.iterdir()
+        if proj_dir.is_dir() and not proj_dir.name.startswith('.')
+        for session_file in proj_dir.glob('*.jsonl')
+    ]
+
+    done = 0
+    if len(session_files) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        try:
+            with ProcessPoolExecutor() as executor:
+                for tally in executor.map(_tally_session_file, session_files, chunksize=4):
+                    done += 1
+                    yield tally
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            # e.g. no working semaphores in sandboxed environments
+            logger.warning(f"Process pool unavailable, parsing serially: {e}")
+
+    # Serial path; also resumes after the last file the pool delivered
+    for session_file in session_files[done:]:
+        yield _tally_session_file(session_file)
+
+
+def _tally_session_file(path: str) -> dict:
+    """Tally one session file (runs in pool workers)."""
+    return _tally_tools_and_files(_iter_session_records(path))
 
-    return stats, history, sessions_data
 
+def _tally_tools_and_files(sessions: Iterable[Any]) -> dict:
+    """Count tool usage, file types, and code changes in a single pass.
 
-def analyze_tools_and_files(sessions_data: list[dict]) -> dict:
-    """Extract tool usage, file types, and code changes."""
-    tool_counts: Counter = Counter()
-    file_extensions: Counter = Counter()
-    languages: Counter = Counter()
+    Returns raw counts; analyze_tools_and_files() merges and ranks them.
+    """
+    tool_counts: dict[str, int] = defaultdict(int)
+    file_extensions: dict[str, int] = defaultdict(int)
+    languages: dict[str, int] = defaultdict(int)
     lines_added = 0
     lines_removed = 0
     files_created = 0
     files_edited = 0
 
-    for item in sessions_data:
-        msg = item.get('message', {})
-        if not isinstance(msg, dict):
-            continue
+    # Happy path is well-formed records: subscript and catch the rare
+    # malformed block or hunk (EAFP), so it is skipped on its own without
+    # cancelling the rest of the record. Keys that are legitimately absent
+    # on many records (message, toolUseResult, structuredPatch) use .get so
+    # ordinary records don't raise.
+    lang_for_ext = EXTENSION_TO_LANG.get
 
-        content = msg.get('content', [])
+    for item in sessions:
+        try:
+            content = item.get('message', {}).get('content', [])
+        except AttributeError:
+            continue  # Record or message isn't an object
+        # Typed user prompts carry their content as a plain string
         if not isinstance(content, list):
             continue
 
         for block in content:
-            if not isinstance(block, dict):
+            try:
+                if block['type'] != 'tool_use':
+                    continue
+            except (KeyError, TypeError):
                 continue
 
-            if block.get('type') == 'tool_use':
-                tool_name = block.get('name', 'unknown')
-                tool_counts[tool_name] += 1
+            tool_name = block.get('name', 'unknown')
+            tool_counts[tool_name] += 1
 
-                inp = block.get('input', {})
-                if not isinstance(inp, dict):
+            if tool_name in FILE_TOOLS:
+                try:
+                    file_path = block['input']['file_path']
+                except (KeyError, TypeError):
                     continue
-
-                if tool_name in ('Edit', 'Write'):
-                    file_path = inp.get('file_path', '')
-                    if file_path:
-                        # Extract extension
-                        filename = file_path.split('/')[-1]
-                        if '.' in filename:
-                            ext = filename.rsplit('.', 1)[-1].lower()
-                            if len(ext) <= 12 and ext.isalnum():
-                                file_extensions[ext] += 1
-                                # Map to language
-                                lang = EXTENSION_TO_LANG.get(ext)
-                                if lang:
-                                    languages[lang] += 1
-
-                        if tool_name == 'Write':
-                            files_created += 1
-                        else:
-                            files_edited += 1
+                if file_path:
+                    # Extension is whatever follows the last '.' of the basename
+                    _, dot, ext = file_path.rpartition('.')
+                    if dot and '/' not in ext:
+                        # Map to language; known extensions need no
+                        # validation. Table keys are lowercase, so a hit
+                        # on the raw extension skips the .lower() copy.
+                        lang = lang_for_ext(ext)
+                        if lang is None:
+                            ext = ext.lower()
+                            lang = lang_for_ext(ext)
+                        if lang is not None:
+                            file_extensions[ext] += 1
+                            languages[lang] += 1
+                        elif len(ext) <= 12 and ext.isalnum():
+                            file_extensions[ext] += 1
+
+                    if tool_name in WRITE_TOOLS:
+                        files_created += 1
+                    else:
+                        files_edited += 1
 
         # Line changes from structuredPatch
-        tool_result = item.get('toolUseResult', {})
-        if isinstance(tool_result, dict):
-            patches = tool_result.get('structuredPatch', [])
-            if isinstance(patches, list):
-                for patch in patches:
-                    if isinstance(patch, dict):
-                        lines = patch.get('lines', [])
-                        if isinstance(lines, list):
-                            for line in lines:
-                                if isinstance(line, str):
-                                    if line.startswith('+') and not line.startswith('+++'):
-                                        lines_added += 1
-                                    elif line.startswith('-') and not line.startswith('---'):
-                                        lines_removed += 1
+        tool_result = item.get('toolUseResult')
+        if not isinstance(tool_result, dict):
+            continue
+        patches = tool_result.get('structuredPatch')
+        if not isinstance(patches, list):
+            continue
+
+        # Stage every hunk's lines into one flat buffer, then count
+        # '+'/'-' lines (minus '+++'/'---' headers) with str.count over the
+        # joined text: one C-level scan per tool result, not a Python loop
+        # per line. Patch lines never contain '\n', so '\n+' marks a line start.
+        staged: list[str] = []
+        for patch in patches:
+            try:
+                lines = patch['lines']
+            except (KeyError, TypeError):
+                continue
+            if isinstance(lines, list):
+                staged += lines
+        if not staged:
+            continue
+        try:
+            text = '\n' + '\n'.join(staged)
+        except TypeError:
+            text = '\n' + '\n'.join([line for line in staged if isinstance(line, str)])
+        lines_added += text.count('\n+') - text.count('\n+++')
+        lines_removed += text.count('\n-') - text.count('\n---')
 
     return {
-        'tool_usage': dict(tool_counts.most_common(20)),
-        'file_extensions': dict(file_extensions.most_common(15)),
-        'languages_from_files': dict(languages.most_common(15)),
-        'total_tool_calls': sum(tool_counts.values()),
+        'tool_counts': dict(tool_counts),
+        'file_extensions': dict(file_extensions),
+        'languages': dict(languages),
         'lines_added': lines_added,
         'lines_removed': lines_removed,
-        'lines_changed': lines_added + lines_removed,
         'files_created': files_created,
         'files_edited': files_edited,
     }
 
 
-def analyze_prompts(history: list[dict]) -> dict:
-    """Extract prompt statistics (no hardcoded categorization)."""
+def analyze_tools_and_files(tallies: Iterable[dict]) -> dict:
+    """Merge per-file tallies into tool usage, file types, and code changes."""
+    tool_counts: dict[str, int] = defaultdict(int)
+    file_extensions: dict[str, int] = defaultdict(int)
+    languages: dict[str, int] = defaultdict(int)
+    totals = dict.fromkeys(('lines_added', 'lines_removed', 'files_created', 'files_edited'), 0)
+
+    # Merging in file order keeps first-seen tie order for _top()
+    for tally in tallies:
+        for merged, key in ((tool_counts, 'tool_counts'),
+                            (file_extensions, 'file_extensions'),
+                            (languages, 'languages')):
+            for name, count in tally[key].items():
+                merged[name] += count
+        for key in totals:
+            totals[key] += tally[key]
+
+    return {
+        'tool_usage': _top(tool_counts, 20),
+        'file_extensions': _top(file_extensions, 15),
+        'languages_from_files': _top(languages, 15),
+        'total_tool_calls': sum(tool_counts.values()),
+        'lines_added': totals['lines_added'],
+        'lines_removed': totals['lines_removed'],
+        'lines_changed': totals['lines_added'] + totals['lines_removed'],
+        'files_created': totals['files_created'],
+        'files_edited': totals['files_edited'],
+    }
+
+
+def _local_weekday_hour(slot: int) -> Optional[tuple[int, int]]:
+    """Local (weekday, hour) for a UTC quarter-hour slot, or None if invalid."""
+    try:
+        dt = datetime.fromtimestamp(slot * (QUARTER_HOUR_MS // 1000))
+    except (ValueError, OSError, OverflowError):
+        return None
+    return dt.weekday(), dt.hour
+
+
+def _histogram_timestamps(timestamps: list[int]) -> tuple[list[int], list[int]]:
+    """Count millisecond timestamps per local weekday (0=Monday) and hour.
+
+    Each local (weekday, hour) is resolved once per quarter-hour slot
+    rather than building a datetime per timestamp.
+    """
+    weekday_counts = [0] * 7
+    hour_counts = [0] * 24
+
+    if np is not None:
+        try:
+            ts = np.array(timestamps, dtype=np.int64)
+        except (TypeError, ValueError, OverflowError):
+            ts = None  # Unexpected timestamp values; use the loop below
+        if ts is not None:
+            slots, counts = np.unique(ts // QUARTER_HOUR_MS, return_counts=True)
+            for slot, count in zip(slots.tolist(), counts.tolist()):
+                local = _local_weekday_hour(slot)
+                if local is not None:
+                    weekday_counts[local[0]] += count
+                    hour_counts[local[1]] += count
+            return weekday_counts, hour_counts
+
+    slot_cache: dict[int, Optional[tuple[int, int]]] = {}
+    for ts in timestamps:
+        slot = ts // QUARTER_HOUR_MS
+        if slot in slot_cache:
+            local = slot_cache[slot]
+        else:
+            local = slot_cache[slot] = _local_weekday_hour(slot)
+        if local is not None:
+            weekday_counts[local[0]] += 1
+            hour_counts[local[1]] += 1
+
+    return weekday_counts, hour_counts
+
+
+def analyze_history(history: HistoryColumns) -> tuple[dict, dict]:
+    """Extract prompt statistics and activity times from history.
+
+    Returns (prompt_stats, activity), where activity holds the weekday and
+    hour distributions consumed by calculate_time_patterns().
+    No hardcoded categorization of prompts.
+    """
     prompt_lengths: list[int] = []
-    project_count: Counter = Counter()
+    project_names: set[str] = set()
     prompts_with_code_blocks = 0
     prompts_with_errors = 0
 
     # Collect word frequency for LLM analysis (top action words)
-    action_words: Counter = Counter()
-    error_indicators = {'error', 'fail', 'bug', 'issue', 'broken', 'crash', 'exception', 'not working'}
+    action_words: dict[str, int] = defaultdict(int)
 
-    for item in history:
-        prompt = item.get('display', '')
+    for prompt, project in zip(history.displays, history.projects):
         if not prompt:
             continue
 
         prompt_lower = prompt.lower()
         prompt_lengths.append(len(prompt))
 
-        project = item.get('project', '')
         if project:
-            project_count[project.split('/')[-1]] += 1
+            project_names.add(project.split('/')[-1])
 
         if '```' in prompt:
             prompts_with_code_blocks += 1
 
-        if any(kw in prompt_lower for kw in error_indicators):
+        if any(kw in prompt_lower for kw in ERROR_INDICATORS):
             prompts_with_errors += 1
 
-        # Extract first few words (likely action/intent)
-        words = prompt_lower.split()[:5]
-        for word in words:
+        # Extract first few words (likely action/intent); maxsplit stops
+        # splitting after the words we keep
+        for word in prompt_lower.split(None, 5)[:5]:
             # Filter to actionable words
             if len(word) > 2 and word.isalpha():
                 action_words[word] += 1
 
-    return {
+    weekday_counts, hour_counts = _histogram_timestamps([ts for ts in history.timestamps if ts])
+
+    prompt_stats = {
         'total_prompts': len(history),
         'avg_prompt_length': round(sum(prompt_lengths) / len(prompt_lengths)) if prompt_lengths else 0,
         'prompts_with_code_blocks': prompts_with_code_blocks,
         'prompts_with_errors': prompts_with_errors,
-        'project_count': len(project_count),
-        'top_action_words': dict(action_words.most_common(30)),
+        'project_count': len(project_names),
+        'top_action_words': _top(action_words, 30),
+    }
+    activity = {
+        'weekday_distribution': {WEEKDAYS[d]: c for d, c in enumerate(weekday_counts) if c},
+        'hour_distribution': {h: c for h, c in enumerate(hour_counts) if c},
     }
+    return prompt_stats, activity
 
 
-def calculate_time_patterns(stats: dict, history: list[dict]) -> dict:
+def calculate_time_patterns(stats: dict, activity: dict) -> dict:
     """Calculate when the user codes."""
     daily_activity = stats.get('dailyActivity', [])
 
     # Busiest day
     busiest = max(daily_activity, key=lambda x: x.get('messageCount', 0)) if daily_activity else {}
 
-    weekday_counts: Counter = Counter()
-    hour_counts: Counter = Counter()
-
-    for item in history:
-        ts = item.get('timestamp', 0)
-        if ts:
-            try:
-                dt = datetime.fromtimestamp(ts / 1000)
-                weekday_counts[dt.strftime('%A')] += 1
-                hour_counts[dt.hour] += 1
-            except (ValueError, OSError):
-                continue
+    hour_dist = activity['hour_distribution']
 
     # Find peak hours
-    peak_hours = hour_counts.most_common(3)
+    peak_hours = nlargest(3, hour_dist.items(), key=itemgetter(1))
 
     # Longest session
     longest = stats.get('longestSession', {})
@@ -294,53 +533,77 @@ def calculate_time_patterns(stats: dict, history: list[dict]) -> dict:
     return {
         'busiest_day_date': busiest.get('date', 'N/A'),
         'busiest_day_messages': busiest.get('messageCount', 0),
-        'weekday_distribution': dict(weekday_counts),
-        'hour_distribution': dict(hour_counts),
+        'weekday_distribution': activity['weekday_distribution'],
+        'hour_distribution': hour_dist,
         'peak_hours': [(h, c) for h, c in peak_hours],
         'longest_session_hours': round(dur_ms / (1000 * 60 * 60), 1) if dur_ms else 0,
         'longest_session_messages': longest.get('messageCount', 0),
     }
 
 
-def get_sample_prompts(history: list[dict], n: int = 20) -> list[str]:
-    """Get diverse sample prompts for LLM to analyze semantically."""
-    good_prompts: list[str] = []
-    sensitive_keywords = {'password', 'secret', 'api_key', 'apikey', 'token', 'credential', 'private_key'}
+def get_sample_prompts(history: HistoryColumns, n: int = 20) -> list[str]:
+    """Get diverse sample prompts for LLM to analyze semantically.
+
+    Reservoir sampling keeps only n candidates in memory while drawing
+    uniformly across the whole timeline in a single pass.
+    """
+    # Fixed seed so re-running the report gives the same sample
+    rng = random.Random(0)
+    reservoir: list[tuple[int, str]] = []
+    seen = 0
 
-    for item in history:
-        prompt = item.get('display', '')
+    for prompt in history.displays:
+        # Filter criteria; cheapest checks first, lowercasing only survivors
+        if (len(prompt) <= 40 or
+                '[Pasted text' in prompt or
+                '[Image' in prompt):
+            continue
         prompt_lower = prompt.lower()
+        if any(kw in prompt_lower for kw in SENSITIVE_KEYWORDS):
+            continue
 
-        # Filter criteria
-        if (len(prompt) > 40 and
-            '[Pasted text' not in prompt and
-            '[Image' not in prompt and
-            not any(kw in prompt_lower for kw in sensitive_keywords)):
-            good_prompts.append(prompt[:200])
+        if seen < n:
+            reservoir.append((seen, prompt[:200]))
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < n:
+                reservoir[slot] = (seen, prompt[:200])
+        seen += 1
 
-    if len(good_prompts) <= n:
-        return good_prompts
+    # Return in timeline order
+    reservoir.sort()
+    return [prompt for _, prompt in reservoir]
 
-    # Sample evenly across timeline
-    step = len(good_prompts) // n
-    return [good_prompts[i * step] for i in range(n)]
+
+def _print_json(obj: Any) -> None:
+    """Print obj to stdout as JSON indented by 2, via orjson when available."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; stdlib json handles them
+        else:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data + b'\n')
+            return
+    print(json.dumps(obj, indent=2))
 
 
 def main() -> int:
     """Main entry point."""
-    stats, history, sessions_data = load_data()
+    stats, history = load_data()
 
     if not history and not stats:
-        print(json.dumps({
+        _print_json({
             "error": "No Claude Code data found.",
             "hint": "Make sure you've used Claude Code (v2.0.64+) and run /stats at least once."
-        }, indent=2))
+        })
         return 1
 
     # Gather analyses
-    tool_analysis = analyze_tools_and_files(sessions_data)
-    prompt_stats = analyze_prompts(history)
-    time_patterns = calculate_time_patterns(stats, history)
+    tool_analysis = analyze_tools_and_files(iter_session_tallies())
+    prompt_stats, activity = analyze_history(history)
+    time_patterns = calculate_time_patterns(stats, activity)
     sample_prompts = get_sample_prompts(history, 20)
 
     # Model usage from stats cache
@@ -399,7 +662,7 @@ def main() -> int:
         'sample_prompts': sample_prompts,
     }
 
-    print(json.dumps(report, indent=2))
+    _print_json(report)
     return 0
 
 